@@ -1,10 +1,16 @@
 import streamlit as st
-import requests
-import json
+import streamlit.components.v1 as components
+import httpx
+import orjson
+from collections import deque
 import os
+import re
+import tempfile
+import uuid
 import time
-from datetime import datetime
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterator, Tuple
 import base64
 from io import BytesIO
 
@@ -23,6 +29,13 @@ DEPLOYMENT_ID = os.getenv("DEPLOYMENT_ID", "")
 DEPLOYMENT_NAME = os.getenv("DEPLOYMENT_NAME", "AI Assistant")
 INDUSTRY_TEMPLATE = os.getenv("INDUSTRY_TEMPLATE", "general")
 
+# Messages kept in memory for rendering; the full history stays in the chat log
+MAX_MESSAGES = 200
+
+# Private directory for per-session chat logs; logs untouched for this long are pruned
+CHAT_LOG_DIR = os.path.join(tempfile.gettempdir(), "streamlit-chat-logs")
+CHAT_LOG_MAX_AGE = 24 * 60 * 60
+
 # Industry-specific configurations
 INDUSTRY_CONFIGS = {
     "legal": {
@@ -75,83 +88,207 @@ INDUSTRY_CONFIGS = {
     }
 }
 
+# Shared HTTP/2 client so uploads and queries multiplex over pooled keep-alive connections.
+# Cached as a resource so the connection pool survives reruns and is shared across sessions.
+@st.cache_resource(show_spinner=False)
+def get_client() -> httpx.Client:
+    """Create the pooled HTTP client used for all backend calls"""
+    transport = httpx.HTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+        # Retries failed connection attempts only. Unlike the previous urllib3 Retry,
+        # httpx does not retry 502/503/504 responses, for any method.
+        retries=3
+    )
+    # httpx rejects a bare "Bearer " header value, so only send it when a key is set
+    headers = {"Authorization": f"Bearer {API_KEY}"} if API_KEY else {}
+    return httpx.Client(
+        transport=transport,
+        headers=headers,
+        timeout=60.0
+    )
+
+# Dash list items at the start of a line, converted to bullets by format_response
+_DASH_RE = re.compile(r"\n-(?=\s)")
+
+def prune_chat_logs():
+    """Create the chat log directory if needed and delete logs past CHAT_LOG_MAX_AGE"""
+    os.makedirs(CHAT_LOG_DIR, mode=0o700, exist_ok=True)
+    cutoff = time.time() - CHAT_LOG_MAX_AGE
+    for entry in os.scandir(CHAT_LOG_DIR):
+        try:
+            if entry.name.endswith(".jsonl") and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            # Another session pruned or cleared it first
+            pass
+
 # Get industry configuration
 config = INDUSTRY_CONFIGS.get(INDUSTRY_TEMPLATE, INDUSTRY_CONFIGS["general"])
 
 # Initialize session state
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = deque(maxlen=MAX_MESSAGES)
+if "message_seq" not in st.session_state:
+    st.session_state.message_seq = 0
+if "chat_log_path" not in st.session_state:
+    prune_chat_logs()
+    st.session_state.chat_log_path = os.path.join(
+        CHAT_LOG_DIR, f"chat_{DEPLOYMENT_ID}_{uuid.uuid4().hex}.jsonl"
+    )
 if "uploaded_documents" not in st.session_state:
     st.session_state.uploaded_documents = []
+if "document_ids" not in st.session_state:
+    st.session_state.document_ids = []
+if "upload_notices" not in st.session_state:
+    st.session_state.upload_notices = []
+if "handled_file_ids" not in st.session_state:
+    # Uploader file ids already sent, kept after removal so Remove doesn't re-upload
+    st.session_state.handled_file_ids = set()
+
+def send_api_request(endpoint: str, method: str = "GET", data: Any = None, files: Any = None,
+                     client: httpx.Client = None) -> httpx.Response:
+    """Send a request to the AI backend without touching the Streamlit UI
 
-def make_api_request(endpoint: str, method: str = "GET", data: Any = None, files: Any = None) -> Dict:
-    """Make API request to the AI backend"""
+    Worker threads must pass a client resolved on the script thread, since
+    get_client() needs the Streamlit script context.
+    """
     url = f"{API_ENDPOINT}{endpoint}"
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-    }
+    client = client or get_client()
     
     if files:
-        response = requests.request(method, url, headers=headers, data=data, files=files)
-    else:
-        headers["Content-Type"] = "application/json"
-        response = requests.request(method, url, headers=headers, json=data)
-    
-    if response.status_code == 200:
-        return response.json()
-    else:
-        st.error(f"API Error: {response.status_code} - {response.text}")
-        return {}
-
-def upload_document(file) -> str:
-    """Upload document to the AI system"""
+        # Let httpx set the multipart Content-Type boundary
+        return client.request(method, url, data=data, files=files)
+    return client.request(method, url, json=data)
+
+def upload_document(file, client: httpx.Client) -> Tuple[str, str]:
+    """Upload document to the AI system, returning (document_id, error_message)
+
+    Safe to call from worker threads: it never renders Streamlit elements.
+    """
     try:
-        files = {"file": (file.name, file.getvalue(), file.type)}
+        # Hand the file object itself to httpx, which streams multipart bodies in chunks
+        file.seek(0)
+        files = {"file": (file.name, file, file.type)}
         data = {"deployment_id": DEPLOYMENT_ID}
         
-        result = make_api_request("/documents/upload", "POST", data=data, files=files)
+        response = send_api_request("/documents/upload", "POST", data=data, files=files, client=client)
         
-        if result:
-            st.success(f"✅ Document '{file.name}' uploaded successfully!")
-            return result.get("document_id", "")
-        else:
-            st.error(f"❌ Failed to upload '{file.name}'")
-            return ""
+        if response.status_code == 200:
+            return orjson.loads(response.content).get("document_id", ""), ""
+        return "", f"API Error: {response.status_code} - {response.text}"
     except Exception as e:
-        st.error(f"❌ Error uploading document: {str(e)}")
-        return ""
+        return "", str(e)
 
-def query_ai(question: str, document_ids: List[str] = None) -> Dict:
-    """Query the AI assistant"""
-    try:
-        data = {
-            "query": question,
-            "deployment_id": DEPLOYMENT_ID,
-            "document_ids": document_ids or [],
-            "max_tokens": 1000,
-            "temperature": 0.7
-        }
-        
-        return make_api_request("/ai/query", "POST", data=data)
-    except Exception as e:
-        st.error(f"❌ Error querying AI: {str(e)}")
-        return {}
+def _iter_sse_deltas(response: httpx.Response, sources: List = None) -> Iterator[str]:
+    """Yield text deltas from an open SSE response, collecting any sources"""
+    for line in response.iter_lines():
+        if not line.startswith("data:"):
+            continue
+        payload = line[len("data:"):].strip()
+        if payload == "[DONE]":
+            break
+        event = orjson.loads(payload)
+        if sources is not None:
+            sources.extend(event.get("sources", []))
+        if event.get("delta"):
+            yield event["delta"]
 
-def format_response(response: str) -> str:
-    """Format AI response with proper markdown"""
-    # Add basic formatting improvements
-    formatted = response.replace("**", "**")  # Ensure bold formatting
-    formatted = formatted.replace("\n-", "\n•")  # Convert dashes to bullets
-    return formatted
+def stream_ai_query(question: str, document_ids: List[str] = None, sources: List = None) -> Iterator[str]:
+    """Stream the AI assistant's answer as text deltas from the SSE endpoint
 
-# Sidebar
-with st.sidebar:
-    st.title(f"{config['icon']} {config['title']}")
-    st.markdown(f"**Deployment:** {DEPLOYMENT_NAME}")
-    st.markdown(f"**ID:** `{DEPLOYMENT_ID[:8]}...`")
+    Each ``data:`` frame carries a JSON object with an optional ``delta`` text
+    chunk and optional ``sources``; any sources seen are appended to ``sources``.
+    The stream ends at a ``[DONE]`` frame or when the server closes it.
+    Backends without the streaming route (404) are queried through the
+    non-streaming ``/ai/query`` endpoint and yield the whole answer at once.
+    """
+    data = {
+        "query": question,
+        "deployment_id": DEPLOYMENT_ID,
+        "document_ids": document_ids or [],
+        "max_tokens": 1000,
+        "temperature": 0.7
+    }
     
-    st.divider()
+    client = get_client()
+    
+    with client.stream("POST", f"{API_ENDPOINT}/ai/query/stream", json=data) as response:
+        streaming_supported = response.status_code != 404
+        if streaming_supported:
+            response.raise_for_status()
+            yield from _iter_sse_deltas(response, sources)
     
+    if not streaming_supported:
+        response = client.post(f"{API_ENDPOINT}/ai/query", json=data)
+        response.raise_for_status()
+        result = orjson.loads(response.content)
+        if sources is not None:
+            sources.extend(result.get("sources", []))
+        if result.get("response"):
+            yield result["response"]
+
+def format_response(response: str) -> str:
+    """Format AI response with proper markdown"""
+    # Most responses have no dash list items; skip the regex pass entirely for those
+    if "\n-" not in response:
+        return response
+    # Convert dash list items to bullets in a single pass
+    return _DASH_RE.sub("\n•", response)
+
+def format_timestamp(ts: int) -> str:
+    """Format a unix timestamp as local wall-clock time for display"""
+    return time.strftime("%H:%M:%S", time.localtime(ts))
+
+def append_message(message: Dict):
+    """Add a message to the chat history and persist it to the session's chat log"""
+    st.session_state.messages.append(message)
+    st.session_state.message_seq += 1
+    record = {
+        "role": message["role"],
+        "content": message["content"],
+        "timestamp": (
+            datetime.fromtimestamp(message["timestamp"], tz=timezone.utc).isoformat()
+            if "timestamp" in message else None
+        ),
+        "sources": message.get("sources", [])
+    }
+    # Append-only JSONL log; opened per message so no handle outlives the write.
+    # Chat content can be sensitive, so the file is readable by its owner only.
+    fd = os.open(st.session_state.chat_log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    with os.fdopen(fd, "ab") as log:
+        log.write(orjson.dumps(record, default=str) + b"\n")
+
+def clear_chat_log():
+    """Delete the session's chat log"""
+    try:
+        os.remove(st.session_state.chat_log_path)
+    except FileNotFoundError:
+        pass
+
+def export_chat_log(path: str, deployment_id: str, deployment_name: str, industry: str) -> bytes:
+    """Wrap the JSONL chat log in an export document
+
+    Log lines are already serialized messages, so they are spliced into the
+    messages array as-is instead of being decoded and re-encoded.
+    """
+    lines = []
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            lines = [line.rstrip(b"\n") for line in f if line.strip()]
+    header = orjson.dumps({
+        "deployment_id": deployment_id,
+        "deployment_name": deployment_name,
+        "industry": industry,
+        "exported_at": datetime.now().isoformat()
+    }, option=orjson.OPT_INDENT_2)
+    # Reopen the header object (drop its closing "\n}") and append the messages array
+    return header[:-2] + b',\n  "messages": [\n    ' + b",\n    ".join(lines) + b"\n  ]\n}"
+
+# Document upload panel reruns on its own, so uploads don't rebuild the rest of the page
+@st.fragment
+def upload_panel():
+    """Sidebar file uploader and list of uploaded documents"""
     # Document Upload Section
     st.subheader("📄 Upload Documents")
     uploaded_files = st.file_uploader(
@@ -162,18 +299,47 @@ with st.sidebar:
     )
     
     if uploaded_files:
-        for file in uploaded_files:
-            if file not in st.session_state.uploaded_documents:
-                with st.spinner(f"Uploading {file.name}..."):
-                    document_id = upload_document(file)
-                    if document_id:
-                        st.session_state.uploaded_documents.append({
-                            "name": file.name,
-                            "id": document_id,
-                            "type": file.type,
-                            "size": file.size,
-                            "uploaded_at": datetime.now()
-                        })
+        new_files = [f for f in uploaded_files if f.file_id not in st.session_state.handled_file_ids]
+        if new_files:
+            notices = []
+            added = False
+            with st.spinner(f"Uploading {len(new_files)} document(s)..."):
+                # Upload concurrently over the pooled session; render results on the main thread
+                client = get_client()
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    futures = {executor.submit(upload_document, f, client): f for f in new_files}
+                    for future in as_completed(futures):
+                        file = futures[future]
+                        document_id, error = future.result()
+                        if document_id:
+                            notices.append(("success", f"✅ Document '{file.name}' uploaded successfully!"))
+                            st.session_state.handled_file_ids.add(file.file_id)
+                            st.session_state.uploaded_documents.append({
+                                "name": file.name,
+                                "id": document_id,
+                                "file_id": file.file_id,
+                                "type": file.type,
+                                "size": file.size,
+                                "uploaded_at": datetime.now()
+                            })
+                            st.session_state.document_ids.append(document_id)
+                            added = True
+                        elif error:
+                            notices.append(("error", f"❌ Error uploading '{file.name}': {error}"))
+                        else:
+                            notices.append(("error", f"❌ Failed to upload '{file.name}'"))
+            st.session_state.upload_notices = notices
+            if added:
+                # Rerun the whole app so the footer's document count picks up the new uploads
+                st.rerun(scope="app")
+    
+    # Upload results, shown after the app-wide rerun
+    for level, message in st.session_state.upload_notices:
+        if level == "success":
+            st.success(message)
+        else:
+            st.error(message)
+    st.session_state.upload_notices = []
     
     # Uploaded Documents List
     if st.session_state.uploaded_documents:
@@ -185,18 +351,29 @@ with st.sidebar:
                 st.write(f"**Uploaded:** {doc['uploaded_at'].strftime('%Y-%m-%d %H:%M')}")
                 if st.button(f"Remove {doc['name']}", key=f"remove_{doc['id']}"):
                     st.session_state.uploaded_documents.remove(doc)
+                    st.session_state.document_ids.remove(doc["id"])
                     st.rerun()
+
+# Sidebar
+with st.sidebar:
+    st.title(f"{config['icon']} {config['title']}")
+    st.markdown(f"**Deployment:** {DEPLOYMENT_NAME}")
+    st.markdown(f"**ID:** `{DEPLOYMENT_ID[:8]}...`")
+    
+    st.divider()
+    
+    upload_panel()
     
     st.divider()
     
     # Sample Questions
     st.subheader("💡 Sample Questions")
-    for question in config["sample_questions"]:
-        if st.button(question, key=f"sample_{hash(question)}"):
-            st.session_state.messages.append({
+    for i, question in enumerate(config["sample_questions"]):
+        if st.button(question, key=f"sample_{i}"):
+            append_message({
                 "role": "user",
                 "content": question,
-                "timestamp": datetime.now()
+                "timestamp": int(time.time())
             })
             st.rerun()
     
@@ -204,151 +381,178 @@ with st.sidebar:
     
     # Clear Chat
     if st.button("🗑️ Clear Chat", type="secondary"):
-        st.session_state.messages = []
+        st.session_state.messages = deque(maxlen=MAX_MESSAGES)
+        clear_chat_log()
         st.rerun()
 
 # Main Chat Interface
 st.title(f"{config['icon']} {config['title']}")
 st.markdown("Ask questions about your documents or get AI assistance for your work.")
 
-# Chat Messages Container
-chat_container = st.container()
-
-with chat_container:
-    # Display chat messages
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            if message["role"] == "user":
-                st.write(message["content"])
-                if "timestamp" in message:
-                    st.caption(f"Asked at {message['timestamp'].strftime('%H:%M:%S')}")
-            else:
-                st.markdown(message["content"])
-                if "sources" in message:
-                    with st.expander("📚 Sources"):
-                        for source in message["sources"]:
-                            st.write(f"• {source}")
-                if "timestamp" in message:
-                    st.caption(f"Responded at {message['timestamp'].strftime('%H:%M:%S')}")
-
-# Chat Input
-if prompt := st.chat_input(config["placeholder"]):
-    # Add user message
-    st.session_state.messages.append({
-        "role": "user",
-        "content": prompt,
-        "timestamp": datetime.now()
-    })
+# JavaScript for auto-scroll; components run in an iframe, so it scrolls the parent page
+AUTOSCROLL_JS = """
+<script>
+    function scrollToBottom() {
+        const doc = window.parent.document;
+        // Streamlit's scroll container: data-testid="stMain" on current releases, section.main on older ones
+        const main = doc.querySelector('[data-testid="stMain"], section.main') || doc.documentElement;
+        main.scrollTo(0, main.scrollHeight);
+    }
     
-    # Display user message immediately
-    with st.chat_message("user"):
-        st.write(prompt)
-        st.caption(f"Asked at {datetime.now().strftime('%H:%M:%S')}")
+    // Auto-scroll when new messages are added
+    setTimeout(scrollToBottom, 100);
+</script>
+"""
+
+# Chat panel reruns on its own, so chat submits don't rebuild the sidebar
+@st.fragment
+def chat_panel():
+    """Chat history, chat input, footer metrics and chat export"""
+    # Chat Messages Container
+    chat_container = st.container()
+    
+    # Footer, advanced features and export, laid out above the chat input
+    footer_container = st.container()
+    
+    # Chat Input. Inside a fragment it renders inline rather than pinned to the
+    # bottom of the page, so it is placed last and the new turn goes into chat_container
+    prompt = st.chat_input(config["placeholder"])
+    
+    with chat_container:
+        # Display chat messages
+        for message in st.session_state.messages:
+            with st.chat_message(message["role"]):
+                if message["role"] == "user":
+                    st.write(message["content"])
+                    if "timestamp" in message:
+                        st.caption(f"Asked at {format_timestamp(message['timestamp'])}")
+                else:
+                    st.markdown(message["content"])
+                    if "sources" in message:
+                        with st.expander("📚 Sources"):
+                            for source in message["sources"]:
+                                st.write(f"• {source}")
+                    if "timestamp" in message:
+                        st.caption(f"Responded at {format_timestamp(message['timestamp'])}")
+
+        if prompt:
+            # Add user message
+            asked_at = int(time.time())
+            append_message({
+                "role": "user",
+                "content": prompt,
+                "timestamp": asked_at
+            })
     
-    # Get AI response
-    with st.chat_message("assistant"):
-        with st.spinner("🤔 Thinking..."):
-            document_ids = [doc["id"] for doc in st.session_state.uploaded_documents]
-            response = query_ai(prompt, document_ids)
+            # Display user message immediately
+            with st.chat_message("user"):
+                st.write(prompt)
+                st.caption(f"Asked at {format_timestamp(asked_at)}")
+    
+            # Stream AI response as it is generated
+            with st.chat_message("assistant"):
+                sources = []
+                response_placeholder = st.empty()
+                try:
+                    ai_response = response_placeholder.write_stream(
+                        stream_ai_query(prompt, st.session_state.document_ids, sources)
+                    )
+                except Exception as e:
+                    # Drop any partial answer so only the error is shown
+                    response_placeholder.empty()
+                    st.error(f"❌ Error querying AI: {str(e)}")
+                    ai_response = None
+        
+                if ai_response is not None:
+                    if not ai_response:
+                        ai_response = "Sorry, I couldn't generate a response."
+                    # Replace the raw streamed text with the formatted version stored in history
+                    formatted_response = format_response(ai_response)
+                    response_placeholder.markdown(formatted_response)
+            
+                    # Display sources if available
+                    if sources:
+                        with st.expander("📚 Sources"):
+                            for source in sources:
+                                st.write(f"• {source}")
             
-            if response:
-                ai_response = response.get("response", "Sorry, I couldn't generate a response.")
-                sources = response.get("sources", [])
-                
-                # Format and display response
-                formatted_response = format_response(ai_response)
-                st.markdown(formatted_response)
-                
-                # Display sources if available
-                if sources:
-                    with st.expander("📚 Sources"):
-                        for source in sources:
-                            st.write(f"• {source}")
-                
-                st.caption(f"Responded at {datetime.now().strftime('%H:%M:%S')}")
-                
-                # Add assistant message to session state
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": formatted_response,
-                    "sources": sources,
-                    "timestamp": datetime.now()
-                })
+                    responded_at = int(time.time())
+                    st.caption(f"Responded at {format_timestamp(responded_at)}")
+            
+                    # Add assistant message to session state
+                    append_message({
+                        "role": "assistant",
+                        "content": formatted_response,
+                        "sources": sources,
+                        "timestamp": responded_at
+                    })
+                else:
+                    error_message = "Sorry, I'm having trouble connecting to the AI service. Please try again."
+                    st.error(error_message)
+                    append_message({
+                        "role": "assistant",
+                        "content": error_message,
+                        "timestamp": int(time.time())
+                    })
+
+    with footer_container:
+        # Footer
+        st.divider()
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric("📄 Documents", len(st.session_state.uploaded_documents))
+
+        with col2:
+            st.metric("💬 Messages", len(st.session_state.messages))
+
+        with col3:
+            if st.session_state.messages:
+                last_message_time = st.session_state.messages[-1]["timestamp"]
+                st.metric("🕒 Last Activity", format_timestamp(last_message_time))
             else:
-                error_message = "Sorry, I'm having trouble connecting to the AI service. Please try again."
-                st.error(error_message)
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": error_message,
-                    "timestamp": datetime.now()
-                })
-
-# Footer
-st.divider()
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.metric("📄 Documents", len(st.session_state.uploaded_documents))
-
-with col2:
-    st.metric("💬 Messages", len(st.session_state.messages))
-
-with col3:
-    if st.session_state.messages:
-        last_message_time = st.session_state.messages[-1]["timestamp"]
-        st.metric("🕒 Last Activity", last_message_time.strftime("%H:%M:%S"))
-    else:
-        st.metric("🕒 Last Activity", "None")
-
-# Advanced Features Section
-with st.expander("⚙️ Advanced Features"):
-    col1, col2 = st.columns(2)
+                st.metric("🕒 Last Activity", "None")
+
+        # Advanced Features Section
+        with st.expander("⚙️ Advanced Features"):
+            col1, col2 = st.columns(2)
     
-    with col1:
-        st.subheader("🎛️ AI Settings")
-        temperature = st.slider("Creativity Level", 0.0, 1.0, 0.7, 0.1, 
-                               help="Lower values = more focused, Higher values = more creative")
-        max_tokens = st.slider("Response Length", 100, 2000, 1000, 100,
-                              help="Maximum length of AI responses")
+            with col1:
+                st.subheader("🎛️ AI Settings")
+                temperature = st.slider("Creativity Level", 0.0, 1.0, 0.7, 0.1, 
+                                       help="Lower values = more focused, Higher values = more creative")
+                max_tokens = st.slider("Response Length", 100, 2000, 1000, 100,
+                                      help="Maximum length of AI responses")
     
-    with col2:
-        st.subheader("📊 Usage Stats")
-        # This would typically pull real usage data
-        st.write("Today's Usage:")
-        st.write("• Queries: 23")
-        st.write("• Documents Processed: 8")
-        st.write("• API Calls: 156")
-
-# Export Chat Option
-if st.session_state.messages:
-    with st.expander("💾 Export Chat"):
-        if st.button("Download Chat History"):
-            chat_export = {
-                "deployment_id": DEPLOYMENT_ID,
-                "deployment_name": DEPLOYMENT_NAME,
-                "industry": INDUSTRY_TEMPLATE,
-                "exported_at": datetime.now().isoformat(),
-                "messages": [
-                    {
-                        "role": msg["role"],
-                        "content": msg["content"],
-                        "timestamp": msg["timestamp"].isoformat() if "timestamp" in msg else None,
-                        "sources": msg.get("sources", [])
-                    }
-                    for msg in st.session_state.messages
-                ]
-            }
-            
-            json_str = json.dumps(chat_export, indent=2)
-            st.download_button(
-                label="📥 Download JSON",
-                data=json_str,
-                file_name=f"chat_history_{DEPLOYMENT_ID[:8]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json"
-            )
+            with col2:
+                st.subheader("📊 Usage Stats")
+                # This would typically pull real usage data
+                st.write("Today's Usage:")
+                st.write("• Queries: 23")
+                st.write("• Documents Processed: 8")
+                st.write("• API Calls: 156")
+
+        # Export Chat Option
+        if st.session_state.messages:
+            with st.expander("💾 Export Chat"):
+                if st.button("Download Chat History"):
+                    json_str = export_chat_log(st.session_state.chat_log_path,
+                                               DEPLOYMENT_ID, DEPLOYMENT_NAME, INDUSTRY_TEMPLATE)
+                    st.download_button(
+                        label="📥 Download JSON",
+                        data=json_str,
+                        file_name=f"chat_history_{DEPLOYMENT_ID[:8]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                        mime="application/json"
+                    )
+
+    # The message sequence number changes the iframe source whenever a message is
+    # added, so the component reloads and the scroll script runs again
+    components.html(f"{AUTOSCROLL_JS}<!-- {st.session_state.message_seq} -->", height=0)
+
+chat_panel()
 
 # Custom CSS for better styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .stChatMessage {
         background-color: #f0f2f6;
@@ -378,16 +582,6 @@ st.markdown("""
         border-radius: 5px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-# JavaScript for auto-scroll (optional)
-st.markdown("""
-<script>
-    function scrollToBottom() {
-        window.scrollTo(0, document.body.scrollHeight);
-    }
-    
-    // Auto-scroll when new messages are added
-    setTimeout(scrollToBottom, 100);
-</script>
-""", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)